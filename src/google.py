@@ -52,10 +52,12 @@ except:
 
 
 __author__ = 'tom.h.miller@gmail.com (Tom Miller)'
+import copy
 import glob
 import logging
 import optparse
 import os
+import stat
 import sys
 import traceback
 import webbrowser
@@ -81,6 +83,15 @@ LOG = logging.getLogger(googlecl.LOGGER_NAME)
 discovery = None
 AVAILABLE_APIS = None
 
+# Maps service name to its package, and (service name, force_gdata_v1) to the
+# module defining its service class. Lets repeated commands in an interactive
+# session skip the imports, including failed attempts to import a client module.
+_service_package_cache = {}
+_service_module_cache = {}
+
+# Maps option names to the prompt asking the user for them.
+_option_prompts = {}
+
 class NonFatalOptionParser(optparse.OptionParser):
   def error(self, message):
     self.error_message = message
@@ -96,8 +107,8 @@ class NonFatalOptionParser(optparse.OptionParser):
 
 # Attempts to sanely parse the command line, considering both the legacy gdata
 # services and the new discovery services which aren't known at runtime.
-def parse_command_line(parser, original_args):
-  (options, args) = parser.parse_args(original_args)
+def parse_command_line(parser, original_args, values=None):
+  (options, args) = parser.parse_args(original_args, values)
 
   # If the discovery API is available and we're using it, then it needs to do
   # its own argument parsing.
@@ -310,7 +321,8 @@ def expand_as_command_line(command_string):
   return args_list
 
 
-def fill_out_options(args, service_header, task, options, config):
+def fill_out_options(args, service_header, task, options, config,
+                     option_dests=None):
   """Fill out required options via config file and command line prompts.
 
   If there are any required fields missing for a task, fill them in.
@@ -331,6 +343,9 @@ def fill_out_options(args, service_header, task, options, config):
     options: Contains attributes that have been specified already, typically
              through options on the command line (see setup_parser()).
     config: Configuration file parser.
+    option_dests: Names of the attributes of options that hold option values
+                  (see setup_parser()). Default None to look them up from
+                  options itself.
 
   Returns:
     Nothing, though options may be modified to hold the required fields.
@@ -342,14 +357,14 @@ def fill_out_options(args, service_header, task, options, config):
     if value:
       return value
     else:
-      return raw_input('Please specify ' + attr + ': ')
+      return _prompt_for_option(attr)
 
   if options.user is None:
     options.user = _retrieve_value('user', service_header)
   if options.hostid is None:
     options.hostid = _retrieve_value('hostid', service_header)
-  missing_reqs = task.get_outstanding_requirements(options)
-  LOG.debug('missing_reqs: ' + str(missing_reqs))
+  missing_reqs = task.get_outstanding_requirements(options, option_dests)
+  LOG.debug('missing_reqs: %s', missing_reqs)
 
   for attr in missing_reqs:
     value = config.lazy_get(service_header, attr)
@@ -357,28 +372,99 @@ def fill_out_options(args, service_header, task, options, config):
       if args:
         value = args.pop(0)
       else:
-        value = raw_input('Please specify ' + attr + ': ')
+        value = _prompt_for_option(attr)
     setattr(options, attr, value)
 
   # Expand those options that might be a filename in disguise.
   max_file_size = 500000    # Value picked arbitrarily - no idea what the max
                             # size in bytes of a summary is.
-  if options.summary and os.path.exists(os.path.expanduser(options.summary)):
-    with open(options.summary, 'r') as summary_file:
-      options.summary = summary_file.read(max_file_size)
-  if options.devkey and os.path.exists(os.path.expanduser(options.devkey)):
-    with open(options.devkey, 'r') as key_file:
-      options.devkey = key_file.read(max_file_size).strip()
+  if options.summary:
+    summary_path = _expand_home(options.summary)
+    if os.path.exists(summary_path):
+      options.summary = _read_small_file(summary_path, max_file_size)
+  if options.devkey:
+    devkey_path = _expand_home(options.devkey)
+    if os.path.exists(devkey_path):
+      options.devkey = _read_small_file(devkey_path, max_file_size).strip()
 
 
-def get_task_help(service, tasks):
-  help = 'Available tasks for service ' + service + \
-         ': ' + str(tasks.keys())[1:-1] + '\n'
-  for task_name in tasks.keys():
-    help += ' ' + task_name + ': ' + tasks[task_name].description + '\n'
-    help += '  ' + tasks[task_name].usage + '\n\n'
+def _expand_home(path):
+  """Expand a leading ~ in path, only calling os.path.expanduser if needed."""
+  if path.startswith('~'):
+    return os.path.expanduser(path)
+  return path
+
+
+def _prompt(message):
+  """Write a prompt to stdout and read one line from stdin.
+
+  Like raw_input(), but without the overhead of going through readline.
+
+  Args:
+    message: Prompt to display.
+
+  Returns:
+    Line read from stdin, without the trailing newline.
+  """
+  sys.stdout.write(message)
+  sys.stdout.flush()
+  line = sys.stdin.readline()
+  if not line:
+    raise EOFError
+  return line.rstrip('\n')
+
+
+def _prompt_for_option(attr):
+  """Prompt the user for the value of an option."""
+  try:
+    message = _option_prompts[attr]
+  except KeyError:
+    message = 'Please specify ' + attr + ': '
+    _option_prompts[attr] = message
+  return _prompt(message)
 
-  return help
+
+def _read_small_file(path, max_size):
+  """Read the contents of a file with as few read calls as possible.
+
+  Skips the buffering file objects do, which is wasted on a file that is
+  read once in full.
+
+  Args:
+    path: Path to the file.
+    max_size: Maximum number of bytes to read.
+
+  Returns:
+    String with (at most max_size bytes of) the contents of the file.
+  """
+  fd = os.open(path, os.O_RDONLY)
+  try:
+    file_stat = os.fstat(fd)
+    if stat.S_ISREG(file_stat.st_mode):
+      # Regular files report their size, so they can be read in one call.
+      max_size = min(file_stat.st_size, max_size)
+    # Pipes and other special files may return less than was asked for, so
+    # keep reading until end of file.
+    chunks = []
+    bytes_read = 0
+    while bytes_read < max_size:
+      chunk = os.read(fd, max_size - bytes_read)
+      if not chunk:
+        break
+      chunks.append(chunk)
+      bytes_read += len(chunk)
+    return ''.join(chunks)
+  finally:
+    os.close(fd)
+
+
+def get_task_help(service, tasks):
+  help_parts = ['Available tasks for service ', service, ': ',
+                ', '.join(tasks), '\n']
+  for task_name, task in tasks.iteritems():
+    help_parts.extend([' ', task_name, ': ', task.description, '\n',
+                       '  ', task.usage, '\n\n'])
+  return ''.join(help_parts)
 
 
 def import_at_runtime(module):
@@ -415,13 +501,13 @@ def import_service(service, config_file_path):
                      options specific to the service.
       config is a configuration file parser.
   """
-  LOG.debug('Your pythonpath: ' + str(os.environ.get('PYTHONPATH')))
+  LOG.debug('Your pythonpath: %s', os.environ.get('PYTHONPATH'))
   try:
-    package = import_at_runtime('googlecl.' + service)
+    package = _import_service_package(service)
   except ImportError, err:
     LOG.error(err.args[0])
     LOG.error('Did you specify the service correctly? Must be one of ' +
-              str(AVAILABLE_SERVICES)[1:-1])
+              ', '.join(AVAILABLE_SERVICES))
     return (None, None, None, None)
 
   config = googlecl.config.load_configuration(config_file_path)
@@ -429,7 +515,47 @@ def import_service(service, config_file_path):
                                    'force_gdata_v1',
                                    default=False,
                                    option_type=bool)
+  service_module = _import_service_module(service, force_gdata_v1)
+  return (service_module.SERVICE_CLASS,
+          package.TASKS,
+          package.SECTION_HEADER,
+          config)
+
+
+def _import_service_package(service):
+  """Import the package for a service, e.g. googlecl.picasa.
+
+  Args:
+    service: Name of the service.
+
+  Returns:
+    Package of the service. Raises ImportError if there is none.
+  """
+  try:
+    return _service_package_cache[service]
+  except KeyError:
+    package = import_at_runtime('googlecl.' + service)
+    _service_package_cache[service] = package
+    return package
+
+
+def _import_service_module(service, force_gdata_v1):
+  """Import the module defining the service class for a service.
+
+  Args:
+    service: Name of the service.
+    force_gdata_v1: True to use the "service" module even if a "client"
+        module exists.
 
+  Returns:
+    The "client" module of the service if it exists and force_gdata_v1 is
+    False, otherwise the "service" module.
+  """
+  key = (service, force_gdata_v1)
+  try:
+    return _service_module_cache[key]
+  except KeyError:
+    pass
   if force_gdata_v1:
     service_module = import_at_runtime('googlecl.' + service + '.service')
   else:
@@ -437,10 +563,8 @@ def import_service(service, config_file_path):
       service_module = import_at_runtime('googlecl.' + service + '.client')
     except ImportError:
       service_module = import_at_runtime('googlecl.' + service + '.service')
-  return (service_module.SERVICE_CLASS,
-          package.TASKS,
-          package.SECTION_HEADER,
-          config)
+  _service_module_cache[key] = service_module
+  return service_module
 
 
 def insert_stdin(options, args, single_arg_symbol='_', split_arg_symbol='__'):
@@ -481,6 +605,22 @@ def insert_stdin(options, args, single_arg_symbol='_', split_arg_symbol='__'):
         break
 
 
+_GENERAL_HELP_INTRO = """Welcome to the Google CL tool!
+  Commands are broken into several parts:
+    service, task, options, and arguments.
+  For example, in the command
+      "> picasa post --title "My Cat Photos" photos/cats/*"
+  the service is "picasa", the task is "post", the single
+  option is a title of "My Cat Photos", and the argument is the
+  path to the photos.
+
+  The available services are
+"""
+_GENERAL_HELP_OUTRO = """  Enter "> help <service>" for more information on a service.
+  Or, just "quit" to quit.
+"""
+
+
 def print_help(service=None, tasks=None):
   """Print help messages to the screen.
 
@@ -490,26 +630,20 @@ def print_help(service=None, tasks=None):
            (Default None)
 
   """
+  # Collect everything and write it out at once, rather than issuing a
+  # write for every line.
   if not service:
-    print 'Welcome to the Google CL tool!'
-    print '  Commands are broken into several parts: '
-    print '    service, task, options, and arguments.'
-    print '  For example, in the command'
-    print '      "> picasa post --title "My Cat Photos" photos/cats/*"'
-    print '  the service is "picasa", the task is "post", the single'
-    print '  option is a title of "My Cat Photos", and the argument is the '
-    print '  path to the photos.'
-    print ''
-    print '  The available services are '
-    print str(AVAILABLE_SERVICES)[1:-1]
+    help_parts = [_GENERAL_HELP_INTRO, ', '.join(AVAILABLE_SERVICES), '\n']
     if apis:
-     print '  and via Discovery:'
-     print str(AVAILABLE_APIS)[1:-1]
-     print '  Enter "> help more" for more detailed help.'
-    print '  Enter "> help <service>" for more information on a service.'
-    print '  Or, just "quit" to quit.'
+      # AVAILABLE_APIS is only filled in once a Discovery command has run.
+      if AVAILABLE_APIS:
+        help_parts.extend(['  and via Discovery:\n',
+                           ', '.join(AVAILABLE_APIS), '\n'])
+      help_parts.append('  Enter "> help more" for more detailed help.\n')
+    help_parts.append(_GENERAL_HELP_OUTRO)
+    sys.stdout.write(''.join(help_parts))
   else:
-    print get_task_help(service, tasks)
+    sys.stdout.write(get_task_help(service, tasks) + '\n')
 
 def print_more_help():
   """ Prints additional help """
@@ -545,6 +679,9 @@ def run_interactive(parser):
   except ImportError:
     LOG.debug('Could not import readline module.')
 
+  # Build the default option values once, and give each command a copy.
+  default_values = parser.get_default_values()
+  option_dests = tuple(parser.defaults)
   while True:
     try:
       command_string = raw_input('> ')
@@ -567,8 +704,9 @@ def run_interactive(parser):
           LOG.error(err)
           continue
 
-        (options, args) = parse_command_line(parser, args_list)
-        run_once(options, args)
+        (options, args) = parse_command_line(parser, args_list,
+                                             copy.copy(default_values))
+        run_once(options, args, option_dests)
 
     except (KeyboardInterrupt, ValueError), err:
       # It would be nice if we could simply unregister or reset the
@@ -597,12 +735,14 @@ def run_interactive(parser):
     readline.write_history_file(history_file)
 
 
-def run_once(options, args):
+def run_once(options, args, option_dests=None):
   """Run one command.
 
   Keyword arguments:
     options: Options instance as built and returned by optparse.
     args: Arguments to GoogleCL, also as returned by optparse.
+    option_dests: Names of the attributes of options that hold option values.
+                  (Default None, see fill_out_options())
 
   """
   global discovery
@@ -701,7 +841,7 @@ def run_once(options, args):
     task.name = task_name
   except KeyError:
     LOG.error('Did not recognize task, please use one of ' + \
-              str(tasks.keys()))
+              ', '.join(tasks))
     return
 
   if 'devkey' in task.required:
@@ -714,7 +854,8 @@ def run_once(options, args):
 
   # fill_out_options will read the key from file if necessary, but will not set
   # it since it will always get a non-empty value beforehand.
-  fill_out_options(args, section_header, task, options, config)
+  fill_out_options(args, section_header, task, options, config,
+                   option_dests)
   client.email = options.user
 
   if options.blog:
@@ -727,12 +868,14 @@ def run_once(options, args):
     googlecl.write_devkey(options.devkey)
 
   # Unicode-ize options and args
-  for attr_name in dir(options):
-    attr = getattr(options, attr_name)
-    if not attr_name.startswith('_') and isinstance(attr, str):
-      setattr(options, attr_name, safe_decode(attr, googlecl.TERMINAL_ENCODING))
+  # Only the option values live in options.__dict__, so there is no need to
+  # sweep through everything dir(options) returns.
+  terminal_encoding = googlecl.get_terminal_encoding()
+  for attr_name, attr in options.__dict__.items():
+    if isinstance(attr, str):
+      setattr(options, attr_name, safe_decode(attr, terminal_encoding))
   if args:
-    args = [safe_decode(string, googlecl.TERMINAL_ENCODING) for string in args]
+    args = [safe_decode(string, terminal_encoding) for string in args]
 
   # Expand options.src. The goal is to expand things like
   # --src=~/Photos/album1/* (which does not normally happen)
@@ -748,13 +891,10 @@ def run_once(options, args):
 
   # Take a gander at the options filled in.
   if LOG.getEffectiveLevel() == logging.DEBUG:
-    import inspect
-    for attr_name in dir(options):
-      if not attr_name.startswith('_'):
-        attr = getattr(options, attr_name)
-        if attr is not None and not inspect.ismethod(attr):
-          LOG.debug(safe_encode('Option ' + attr_name + ': ' + unicode(attr)))
-  LOG.debug(safe_encode('args: ' + unicode(args)))
+    for attr_name, attr in sorted(options.__dict__.iteritems()):
+      if attr is not None:
+        LOG.debug(safe_encode('Option ' + attr_name + ': ' + unicode(attr)))
+    LOG.debug(safe_encode('args: ' + unicode(args)))
 
   auth_manager = googlecl.authentication.AuthenticationManager(service, client)
   authenticated = authenticate(auth_manager, options, config, section_header)
@@ -804,7 +944,7 @@ def setup_logger(options):
   # XXX: Inappropriate location (style-wise).
   if options.debug or options.verbose:
     import gdata
-    LOG.debug('Gdata will be imported from ' + gdata.__file__)
+    LOG.debug('Gdata will be imported from %s', gdata.__file__)
 
 
 def setup_parser(loading_usage):
@@ -852,7 +992,7 @@ def setup_parser(loading_usage):
     for service in AVAILABLE_SERVICES:
       if service == 'help':
         continue
-      service_package = import_at_runtime('googlecl.' + service)
+      service_package = _import_service_package(service)
       usage += get_task_help(service, service_package.TASKS) + '\n'
 
   parser = NonFatalOptionParser(usage=usage, version=sys.argv[0] + VERSION)
@@ -978,6 +1118,7 @@ def main():
   """Entry point for GoogleCL script."""
   loading_usage = '--help' in sys.argv
   parser = setup_parser(loading_usage)
+  option_dests = tuple(parser.defaults)
 
   (options, args) = parse_command_line(parser, sys.argv[1:])
 
@@ -990,7 +1131,7 @@ def main():
     insert_stdin(options, args)
 
     try:
-      run_once(options, args)
+      run_once(options, args, option_dests)
     except KeyboardInterrupt:
       print ''
 
@@ -0,0 +1,61 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2010 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the help output of google.py."""
+
+import google
+import StringIO
+import sys
+import unittest
+
+
+class PrintHelpTest(unittest.TestCase):
+
+  def setUp(self):
+    self.saved_apis = google.apis
+    self.saved_available_apis = google.AVAILABLE_APIS
+    self.saved_stdout = sys.stdout
+    sys.stdout = StringIO.StringIO()
+
+  def tearDown(self):
+    google.apis = self.saved_apis
+    google.AVAILABLE_APIS = self.saved_available_apis
+    sys.stdout = self.saved_stdout
+
+  def getHelp(self):
+    google.print_help()
+    return sys.stdout.getvalue()
+
+  def testServicesListed(self):
+    google.apis = False
+    self.assertTrue(', '.join(google.AVAILABLE_SERVICES) in self.getHelp())
+
+  def testDiscoveryApisNotLoaded(self):
+    google.apis = True
+    google.AVAILABLE_APIS = None
+    help_text = self.getHelp()
+    self.assertFalse('and via Discovery' in help_text)
+    self.assertTrue('help more' in help_text)
+
+  def testDiscoveryApisLoaded(self):
+    google.apis = True
+    google.AVAILABLE_APIS = ['plus', 'urlshortener']
+    help_text = self.getHelp()
+    self.assertTrue('and via Discovery:\nplus, urlshortener\n' in help_text)
+
+
+if __name__ == '__main__':
+  unittest.main()
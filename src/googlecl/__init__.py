@@ -19,22 +19,33 @@ from __future__ import with_statement
 __author__ = 'tom.h.miller@gmail.com (Tom Miller)'
 import logging
 import os
-import re
+import stat
+import sys
 import googlecl.config.parser
 
+# Expanded once, since os.path.expanduser may have to query the password
+# database.
+_HOME = os.path.expanduser('~')
 SUBDIR_NAME = 'googlecl'
-DEFAULT_GOOGLECL_DIR = os.path.expanduser(os.path.join('~', '.googlecl'))
+DEFAULT_GOOGLECL_DIR = os.path.join(_HOME, '.googlecl')
 HISTORY_FILENAME = 'history'
 TOKENS_FILENAME_FORMAT = 'access_tok_%s'
 DEVKEY_FILENAME = 'yt_devkey'
 
-FILE_EXT_PATTERN = re.compile('.*\.([a-zA-Z0-9]{2,}$)')
+# Characters allowed in a file extension recognized by get_extension_from_path.
+FILE_EXT_CHARACTERS = ('abcdefghijklmnopqrstuvwxyz'
+                       'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+                       '0123456789')
 LOGGER_NAME = __name__
 LOG = logging.getLogger(LOGGER_NAME)
 
+# Maps get_xdg_path() arguments to the path it returned.
+_xdg_path_cache = {}
+# Maps directory paths to the set of names in that directory.
+_dir_listing_cache = {}
+
 
 def determine_terminal_encoding(config=None):
-  import sys
   in_enc = ''
   out_enc = ''
   if sys.stdin.encoding:
@@ -61,18 +72,25 @@ def determine_terminal_encoding(config=None):
     # Both defined, but are not the same
     if in_enc and out_enc:
       LOG.warning('HEY! You have a different encoding for input and output')
-      LOG.warning('Input: ' + in_enc)
-      LOG.warning('Output: ' + in_enc)
+      LOG.warning('Input: %s', in_enc)
+      LOG.warning('Output: %s', out_enc)
     return_enc = out_enc or in_enc
-  LOG.debug('determine_terminal_encoding(): ' + return_enc)
+  LOG.debug('determine_terminal_encoding(): %s', return_enc)
   return return_enc
 
 
-# Because this gets done at googlecl module load, there's no config parser
-# to pass in.
-#XXX: googlecl.config.load_configuration() currently sets this again,
-# but that's less than optimal...
-TERMINAL_ENCODING = determine_terminal_encoding()
+# Determined on first use by get_terminal_encoding().
+# googlecl.config.load_configuration() sets this again, since the config file
+# may specify a default encoding.
+TERMINAL_ENCODING = None
+
+
+def get_terminal_encoding():
+  """Return TERMINAL_ENCODING, determining it first if necessary."""
+  global TERMINAL_ENCODING
+  if TERMINAL_ENCODING is None:
+    TERMINAL_ENCODING = determine_terminal_encoding()
+  return TERMINAL_ENCODING
 
 
 class SafeEncodeError(Exception):
@@ -96,24 +114,38 @@ def build_titles_list(title, args):
   """
   # If args is non-empty, assume the user is giving us titles to get
   if args:
-    titles_list = args
-    # If options.title is also given, add it to the list of titles
+    # If options.title is also given, add it to the list of titles.
+    # Concatenating copies args once, where insert(0, ...) would shift it.
     if title:
-      titles_list.insert(0,title)
+      return [title] + args
+    return args
   else:
-    titles_list = [title]
-  return titles_list
+    return [title]
 
 
 def get_extension_from_path(path):
-  """Return the extension of a file."""
-  match = FILE_EXT_PATTERN.match(path)
-  if match:
-    return match.group(1)
+  """Return the extension of a file.
+
+  The extension is whatever follows the last '.' in path, provided it is at
+  least two characters long and only contains letters and digits.
+  """
+  _, dot, ext = path.rpartition('.')
+  if dot and len(ext) >= 2 and not ext.strip(FILE_EXT_CHARACTERS):
+    return ext
   else:
     return None
 
 
+def clear_xdg_path_cache():
+  """Forget paths found by get_xdg_path().
+
+  Should be called after creating a file that get_xdg_path() may have been
+  asked to find, so the next lookup sees it.
+  """
+  _xdg_path_cache.clear()
+  _dir_listing_cache.clear()
+
+
 def get_data_path(filename,
                   default_directories=None,
                   create_missing_dir=False):
@@ -146,40 +178,77 @@ def get_xdg_path(filename, data_type, default_directories=None,
   Returns:
     Path to config file, which may not exist. If create_missing_dir,
     the directory where the config file should be will be created if it
-    does not exist.
+    does not exist. Results are cached; see clear_xdg_path_cache().
 
   """
   data_type = data_type.upper()
   if data_type not in ('CONFIG', 'DATA'):
     raise Exception('Invalid value for data_type: ' + data_type)
-  xdg_home_dir = os.environ.get('XDG_' + data_type + '_HOME')
-  if not xdg_home_dir:
-    home_dir = os.path.expanduser('~')
-    if data_type == 'DATA':
-      xdg_home_dir = os.path.join(home_dir, '.local', 'share')
-    elif data_type == 'CONFIG':
-      # No variable defined, using $HOME/.config
-      xdg_home_dir = os.path.join(home_dir, '.config')
-  xdg_home_dir = os.path.join(xdg_home_dir, SUBDIR_NAME)
-
-  xdg_dir_list = os.environ.get('XDG_' + data_type + '_DIRS')
-  if not xdg_dir_list:
-    if data_type == 'DATA':
-      xdg_dir_list = '/usr/local/share/:/usr/share/'
-    elif data_type == 'CONFIG':
-      xdg_dir_list = '/etc/xdg'
-  xdg_dir_list = [os.path.join(d, SUBDIR_NAME)
-                  for d in xdg_dir_list.split(':')]
+  cache_key = (filename, data_type, tuple(default_directories or ()),
+               create_missing_dir)
+  try:
+    return _xdg_path_cache[cache_key]
+  except KeyError:
+    path = _find_xdg_path(filename, data_type, default_directories,
+                          create_missing_dir)
+  if path:
+    _xdg_path_cache[cache_key] = path
+  return path
 
+
+def _build_xdg_dirs():
+  """Build the XDG directories to search for GoogleCL files.
+
+  Returns:
+    Dictionary mapping 'CONFIG' and 'DATA' to a tuple of (home directory,
+    list of system directories), each with SUBDIR_NAME appended.
+  """
+  xdg_dirs = {}
+  for data_type in ('CONFIG', 'DATA'):
+    xdg_home_dir = os.environ.get('XDG_' + data_type + '_HOME')
+    if not xdg_home_dir:
+      if data_type == 'DATA':
+        xdg_home_dir = os.path.join(_HOME, '.local', 'share')
+      elif data_type == 'CONFIG':
+        # No variable defined, using $HOME/.config
+        xdg_home_dir = os.path.join(_HOME, '.config')
+    xdg_home_dir = os.path.join(xdg_home_dir, SUBDIR_NAME)
+
+    xdg_dir_list = os.environ.get('XDG_' + data_type + '_DIRS')
+    if not xdg_dir_list:
+      if data_type == 'DATA':
+        xdg_dir_list = '/usr/local/share/:/usr/share/'
+      elif data_type == 'CONFIG':
+        xdg_dir_list = '/etc/xdg'
+    xdg_dir_list = [os.path.join(d, SUBDIR_NAME)
+                    for d in xdg_dir_list.split(':')]
+    xdg_dirs[data_type] = (xdg_home_dir, xdg_dir_list)
+  return xdg_dirs
+
+
+# The environment variables these come from do not change while we run.
+_XDG_DIRS = _build_xdg_dirs()
+
+
+def _find_xdg_path(filename, data_type, default_directories,
+                   create_missing_dir):
+  """Search the filesystem for a file. See get_xdg_path()."""
+  xdg_home_dir, xdg_dir_list = _XDG_DIRS[data_type]
   dir_list = [os.path.abspath('.'), xdg_home_dir] + xdg_dir_list +\
              [DEFAULT_GOOGLECL_DIR]
   if default_directories:
     dir_list += default_directories
+  # Only the GoogleCL directories are listed (and cached). The working
+  # directory and default_directories may hold any number of unrelated
+  # files, so a single stat is cheaper there.
+  listed_dirs = set([xdg_home_dir, DEFAULT_GOOGLECL_DIR] + xdg_dir_list)
   for directory in dir_list:
+    if directory in listed_dirs and filename not in _list_directory(directory):
+      continue
     config_path = os.path.join(directory, filename)
     if os.path.isfile(config_path):
       return config_path
-  LOG.debug('Could not find ' + filename + ' in any of ' + str(dir_list))
+  LOG.debug('Could not find %s in any of %s', filename, dir_list)
 
   if os.name == 'posix':
     default_dir = xdg_home_dir
@@ -196,6 +265,23 @@ def get_xdg_path(filename, data_type, default_directories=None,
   return os.path.join(default_dir, filename)
 
 
+def _list_directory(directory):
+  """Return the set of names in a directory, listing it at most once.
+
+  Missing or unreadable directories are treated as empty.
+  """
+  try:
+    return _dir_listing_cache[directory]
+  except KeyError:
+    pass
+  try:
+    listing = set(os.listdir(directory))
+  except OSError:
+    listing = set()
+  _dir_listing_cache[directory] = listing
+  return listing
+
+
 def read_devkey():
   """Return the cached YouTube developer's key."""
   key_path = get_data_path(DEVKEY_FILENAME)
@@ -206,7 +292,7 @@ def read_devkey():
   return devkey
 
 
-def safe_encode(string, target_encoding=TERMINAL_ENCODING,
+def safe_encode(string, target_encoding=None,
                 errors='backslashreplace'):
   """Encode a unicode string to target_encoding.
 
@@ -216,7 +302,8 @@ def safe_encode(string, target_encoding=TERMINAL_ENCODING,
 
   Args:
     string: unicode String to encode.
-    target_encoding: str Encoding to encode to. Default TERMINAL_ENCODING.
+    target_encoding: str Encoding to encode to. Default None to use
+                     get_terminal_encoding().
     errors: str Name of the error handler to call if something goes wrong.
             See docs on the codecs module. Default 'backslashreplace'.
 
@@ -224,6 +311,8 @@ def safe_encode(string, target_encoding=TERMINAL_ENCODING,
     A string encoded with target_encoding, or raises an error.
 
   """
+  if target_encoding is None:
+    target_encoding = get_terminal_encoding()
   if isinstance(string, unicode):
     return string.encode(target_encoding, errors)
   elif isinstance(string, str):
@@ -271,8 +360,8 @@ def safe_decode(string, current_encoding='utf-8', errors='strict'):
 
 def write_devkey(devkey):
   """Write the devkey to the youtube devkey file."""
-  import stat
   key_path = get_data_path(DEVKEY_FILENAME)
   with open(key_path, 'w') as key_file:
     os.chmod(key_path, stat.S_IRUSR | stat.S_IWUSR)
     key_file.write(devkey)
+  clear_xdg_path_cache()
@@ -17,14 +17,25 @@ from __future__ import with_statement
 
 import logging
 import os
-import pickle
-import stat
+try:
+  import cPickle as pickle
+except ImportError:
+  import pickle
 import googlecl
 
 TOKENS_FILENAME_FORMAT = 'access_tok_%s'
 LOGGER_NAME = __name__
 LOG = logging.getLogger(LOGGER_NAME)
 
+# Errors raised when unpickling a damaged tokens file. The pure Python pickle
+# module tends to raise KeyError or IndexError, cPickle UnpicklingError.
+CORRUPT_TOKENS_ERRORS = (KeyError, IndexError, EOFError, ValueError,
+                         pickle.UnpicklingError)
+
+# Maps the path of a tokens file to the dictionary last read from or written
+# to it, so reading tokens does not unpickle the file every time.
+_tokens_cache = {}
+
 #XXX: Public-facing functions are confusing, clean up.
 class AuthenticationManager(object):
   """Handles OAuth token for a given service."""
@@ -60,7 +71,7 @@ class AuthenticationManager(object):
       # Attribute errors crop up when using different gdata libraries
       # but the same token.
       token_valid = False
-      LOG.debug('Caught AttributeError: ' + str(err))
+      LOG.debug('Caught AttributeError: %s', err)
     if token_valid:
       LOG.debug('Token valid!')
       return True
@@ -87,17 +98,18 @@ class AuthenticationManager(object):
   def _move_failed_token_file(self):
     """Backs up failed tokens file."""
     new_path = self.tokens_path + '.failed'
-    LOG.debug('Moving ' + self.tokens_path + ' to ' + new_path)
+    LOG.debug('Moving %s to %s', self.tokens_path, new_path)
     if os.path.isfile(new_path):
-      LOG.debug(new_path + ' already exists. Deleting it.')
+      LOG.debug('%s already exists. Deleting it.', new_path)
       try:
         os.remove(new_path)
       except EnvironmentError, err:
-        LOG.debug('Cannot remove old failed token file: ' + str(err))
+        LOG.debug('Cannot remove old failed token file: %s', err)
     try:
       os.rename(self.tokens_path, new_path)
     except EnvironmentError, err:
-      LOG.debug('Cannot rename token file to ' + new_path + ': ' + str(err))
+      LOG.debug('Cannot rename token file to %s: %s', new_path, err)
+    _tokens_cache[self.tokens_path] = {}
 
   def read_access_token(self):
     """Tries to read an authorization token from a file.
@@ -106,20 +118,11 @@ class AuthenticationManager(object):
       The access token, if it exists. If the access token cannot be read,
       returns None.
     """
-    if os.path.exists(self.tokens_path):
-      with open(self.tokens_path, 'rb') as tokens_file:
-        try:
-          tokens_dict = pickle.load(tokens_file)
-        except ImportError:
-          return None
-      try:
-        token = tokens_dict[self.service]
-      except KeyError:
-        return None
-      else:
-        return token
-    else:
+    try:
+      tokens_dict = _load_tokens_dict(self.tokens_path)
+    except ImportError:
       return None
+    return tokens_dict.get(self.service)
 
   def remove_access_token(self):
     """Removes an auth token.
@@ -127,38 +130,29 @@ class AuthenticationManager(object):
     Returns:
       True if the token was removed from the tokens file, False otherwise.
     """
-    success = False
-    file_invalid = False
-    if os.path.exists(self.tokens_path):
-      with open(self.tokens_path, 'r+') as tokens_file:
-        try:
-          tokens_dict = pickle.load(tokens_file)
-        except ImportError, err:
-          LOG.error(err)
-          LOG.info('You probably have been using different versions of gdata.')
-          self._move_failed_token_file()
-          return False
-        except IndexError, err:
-          LOG.error(err)
-          self._move_failed_token_file()
-          return False
-
-        try:
-          del tokens_dict[self.service]
-        except KeyError:
-          LOG.debug('No token for ' + self.service)
-        else:
-          try:
-            pickle.dump(tokens_dict, tokens_file)
-          except EnvironmentError, err:
-            # IOError (extends enverror) shouldn't happen, but I've seen
-            # IOError Errno 0 pop up on Windows XP with Python 2.5.
-            LOG.error(err)
-            if err.errno == 0:
-              _move_failed_token_file()
-          else:
-            success = True
-    return success
+    try:
+      tokens_dict = _read_tokens_file(self.tokens_path)
+    except ImportError, err:
+      LOG.error(err)
+      LOG.info('You probably have been using different versions of gdata.')
+      self._move_failed_token_file()
+      return False
+    except CORRUPT_TOKENS_ERRORS, err:
+      LOG.error(err)
+      self._move_failed_token_file()
+      return False
+
+    try:
+      del tokens_dict[self.service]
+    except KeyError:
+      LOG.debug('No token for %s', self.service)
+      return False
+    try:
+      _write_tokens_file(self.tokens_path, tokens_dict)
+    except EnvironmentError, err:
+      LOG.error(err)
+      return False
+    return True
 
   def retrieve_access_token(self, display_name, browser_object):
     """Requests a new access token from Google, writes it upon retrieval.
@@ -197,7 +191,7 @@ class AuthenticationManager(object):
     """
     try:
       token = self.read_access_token()
-    except (KeyError, IndexError):
+    except CORRUPT_TOKENS_ERRORS:
       LOG.warning('Token file appears to be corrupted. Not using.')
     else:
       if token:
@@ -233,30 +227,97 @@ class AuthenticationManager(object):
     Args:
       token: Token object to store.
     """
-    if os.path.exists(self.tokens_path):
-      with open(self.tokens_path, 'rb') as tokens_file:
-        try:
-          tokens_dict = pickle.load(tokens_file)
-        except (KeyError, IndexError), err:
-          LOG.error(err)
-          LOG.error('Failed to load token file (may be corrupted?)')
-          file_invalid = True
-        except ImportError, err:
-          LOG.error(err)
-          LOG.info('You probably have been using different versions of gdata.')
-          file_invalid = True
-        else:
-          file_invalid = False
-      if file_invalid:
-        self._move_failed_token_file()
-        tokens_dict = {}
+    try:
+      tokens_dict = _read_tokens_file(self.tokens_path)
+    except CORRUPT_TOKENS_ERRORS, err:
+      LOG.error(err)
+      LOG.error('Failed to load token file (may be corrupted?)')
+      file_invalid = True
+    except ImportError, err:
+      LOG.error(err)
+      LOG.info('You probably have been using different versions of gdata.')
+      file_invalid = True
     else:
-      tokens_dict = {}
+      file_invalid = False
+    if file_invalid:
+      self._move_failed_token_file()
+      tokens_dict = _tokens_cache[self.tokens_path]
     tokens_dict[self.service] = token
-    with open(self.tokens_path, 'wb') as tokens_file:
-      # Ensure only the owner of the file has read/write permission
-      os.chmod(self.tokens_path, stat.S_IRUSR | stat.S_IWUSR)
-      pickle.dump(tokens_dict, tokens_file)
+    _write_tokens_file(self.tokens_path, tokens_dict)
+
+
+def _load_tokens_dict(tokens_path):
+  """Returns the dictionary of tokens stored in a tokens file.
+
+  The file is only read the first time a given path is requested. Later calls
+  return the cached dictionary, which is kept up to date by
+  _read_tokens_file() and _write_tokens_file().
+
+  Args:
+    tokens_path: Path to the tokens file.
+
+  Returns:
+    Dictionary mapping service names to tokens. Empty if the file does not
+    exist. Errors raised while unpickling the file are passed on.
+  """
+  try:
+    return _tokens_cache[tokens_path]
+  except KeyError:
+    return _read_tokens_file(tokens_path)
+
+
+def _read_tokens_file(tokens_path):
+  """Reads the dictionary of tokens stored in a tokens file, and caches it.
+
+  Unlike _load_tokens_dict(), always reads the file, so tokens written by
+  other GoogleCL processes are picked up.
+
+  Args:
+    tokens_path: Path to the tokens file.
+
+  Returns:
+    Dictionary mapping service names to tokens. Empty if the file does not
+    exist. Errors raised while unpickling the file are passed on.
+  """
+  if os.path.exists(tokens_path):
+    with open(tokens_path, 'rb') as tokens_file:
+      tokens_dict = pickle.load(tokens_file)
+  else:
+    tokens_dict = {}
+  _tokens_cache[tokens_path] = tokens_dict
+  return tokens_dict
+
+
+def _write_tokens_file(tokens_path, tokens_dict):
+  """Replaces a tokens file with a pickled dictionary of tokens.
+
+  The dictionary is written to a temporary file which is then renamed over
+  the tokens file, so an interrupted write cannot leave a truncated file.
+
+  Args:
+    tokens_path: Path to the tokens file.
+    tokens_dict: Dictionary mapping service names to tokens.
+  """
+  tmp_path = tokens_path + '.tmp'
+  is_new_file = not os.path.exists(tokens_path)
+  if os.path.exists(tmp_path):
+    os.remove(tmp_path)
+  # Create the file with only the owner having read/write permission, rather
+  # than changing the permissions after the fact.
+  flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+  fd = os.open(tmp_path, flags, 0600)
+  try:
+    os.write(fd, pickle.dumps(tokens_dict, pickle.HIGHEST_PROTOCOL))
+  finally:
+    os.close(fd)
+  if os.name != 'posix' and os.path.exists(tokens_path):
+    # rename() will not replace an existing file on Windows.
+    os.remove(tokens_path)
+  os.rename(tmp_path, tokens_path)
+  _tokens_cache[tokens_path] = tokens_dict
+  if is_new_file:
+    # Let later path lookups find the file we just created.
+    googlecl.clear_xdg_path_cache()
 
 
 def get_hd_domain(username, default_domain='default'):
@@ -246,8 +246,7 @@ class BaseCL(object):
     # Check if title is NoneType, empty string, empty list, or a single-item
     # list containing any of the prior.
     if not titles or (len(titles) == 1 and not titles[0]):
-      LOG.debug('Retrieved ' + str(len(all_entries)) +
-                ' entries, returning them all')
+      LOG.debug('Retrieved %d entries, returning them all', len(all_entries))
       return all_entries
 
     if self.use_regex:
@@ -256,7 +255,8 @@ class BaseCL(object):
         title_regex = titles
       else:
         title_regex = safe_decode('|'.join(titles))
-      LOG.debug(safe_encode('Using regex: ' + title_regex))
+      if LOG.isEnabledFor(logging.DEBUG):
+        LOG.debug(safe_encode('Using regex: ' + title_regex))
       try:
         entries = [entry for entry in all_entries
                    if entry.title.text and
@@ -271,8 +271,8 @@ class BaseCL(object):
         title_list = [titles]
       entries = [entry for entry in all_entries
                  if safe_decode(entry.title.text) in title_list]
-    LOG.debug('Retrieved ' + str(len(all_entries)) +
-              ' entries, returning ' + str(len(entries)) + ' of them')
+    LOG.debug('Retrieved %d entries, returning %d of them',
+              len(all_entries), len(entries))
     return entries
 
   GetEntries = get_entries
@@ -339,7 +339,7 @@ class BaseCL(object):
       # Try to limit the number of results we get.
       self.Get(test_uri)
     except self.request_error, err:
-      LOG.debug('Token invalid! ' + str(err))
+      LOG.debug('Token invalid! %s', err)
       return False
     else:
       return True
@@ -385,17 +385,17 @@ class BaseCL(object):
         if status_code in HTTP_ERROR_CODES_TO_RETRY_ON:
           attempts_remaining -= 1
           LOG.debug('Retrying when you would have failed otherwise!')
-          LOG.debug('Arguments: %s' % str(args))
-          LOG.debug('Keyword arguments: %s' % kwargs)
-          LOG.debug('Error: %s' % err)
+          LOG.debug('Arguments: %s', args)
+          LOG.debug('Keyword arguments: %s', kwargs)
+          LOG.debug('Error: %s', err)
           if try_forever or attempts_remaining:
             time.sleep(self.retry_delay)
         else:
           raise err
       except Exception, unexpected:
-        LOG.debug('unexpected exception: %s' % unexpected)
-        LOG.debug('Arguments: %s' % str(args))
-        LOG.debug('Keyword arguments: %s' % kwargs)
+        LOG.debug('unexpected exception: %s', unexpected)
+        LOG.debug('Arguments: %s', args)
+        LOG.debug('Keyword arguments: %s', kwargs)
         raise unexpected
     # Can only leave above loop if err is set at least once.
     raise err
@@ -467,7 +467,7 @@ class Task(object):
       args_desc = ' Arguments: ' + args_desc
     self.usage = 'Requires: ' + req_str + opt_str + args_desc
 
-  def get_outstanding_requirements(self, options):
+  def get_outstanding_requirements(self, options, option_names=None):
     """Return a list of required options that are missing.
 
     The requirements that have been specified in <options> are removed
@@ -478,14 +478,18 @@ class Task(object):
     Args:
       options: instance Has attributes with names corresponding to the
                requirements specified by self.required and self.optional
+      option_names: Names of all the attributes of options that hold option
+                    values, e.g. the keys of an optparse parser's defaults.
+                    (Default None to use the attributes in options.__dict__)
 
     Returns:
       A subset of self.required containing only strings representing unmet
       requirements.
     """
-    missing_options_set = set(attr for attr in dir(options)
-                              if not attr.startswith('_') and
-                              getattr(options, attr) is None)
+    if option_names is None:
+      option_names = options.__dict__.keys()
+    missing_options_set = set(attr for attr in option_names
+                              if getattr(options, attr, None) is None)
     missing_requirements = []
     for requirement in self.required:
       if isinstance(requirement, list):
@@ -683,14 +687,14 @@ def compile_entry_string(wrapped_entry, attribute_list, delimiter,
       # with the missing field value.
       val = getattr(wrapped_entry, attr.replace('-','_')) or missing_field_value
     except ValueError, err:
-      LOG.debug(err.args[0] + ' (Did not add value for field ' + attr + ')')
+      LOG.debug('%s (Did not add value for field %s)', err.args[0], attr)
     except AttributeError, err:
-      LOG.debug(err.args[0] + ' (value for field ' + attr + ')')
+      LOG.debug('%s (value for field %s)', err.args[0], attr)
       try:
         # Last ditch effort to blindly grab the attribute
         val = getattr(wrapped_entry.entry, attr).text or missing_field_value
       except AttributeError:
-        LOG.debug(err.args[0] + ' (value for field ' + attr + ')')
+        LOG.debug('%s (value for field %s)', err.args[0], attr)
         val = missing_field_value
     # Apparently, atom(?) doesn't always return a Unicode type when there are
     # non-latin characters, so force everything to Unicode.
@@ -706,7 +710,7 @@ def compile_entry_string(wrapped_entry, attribute_list, delimiter,
       return_string = return_string.replace('\n', newline_replacer)
 
   return_string = return_string.rstrip(delimiter)
-  return_string = return_string.encode(googlecl.TERMINAL_ENCODING,
+  return_string = return_string.encode(googlecl.get_terminal_encoding(),
                                        'backslashreplace')
   return return_string
 
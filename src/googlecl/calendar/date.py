@@ -370,7 +370,7 @@ class DateParser(object):
     else:
       date, valid_format = self._extract_time(day_token, ACCEPTED_DAY_FORMATS)
       if not date:
-        LOG.debug('%s did not match any expected day formats' % day_token)
+        LOG.debug('%s did not match any expected day formats', day_token)
         return None
       # If the year was not explicitly mentioned...
       # (strptime will set a default year of 1900)
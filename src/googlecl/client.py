@@ -88,7 +88,7 @@ class BaseClientCL(googlecl.base.BaseCL):
       if isinstance(scope, tuple):
         scopes[i:i+1] = list(scope)
     scopes.extend(['https://www.googleapis.com/auth/userinfo#email'])
-    LOG.debug('Scopes being requested: ' + str(scopes))
+    LOG.debug('Scopes being requested: %s', scopes)
 
     url = gdata.gauth.REQUEST_TOKEN_URL + '?xoauth_displayname=' +\
           urllib.quote(display_name)
@@ -15,6 +15,9 @@ import ConfigParser
 import googlecl
 import parser
 
+# Maps config file paths to the parser last loaded from them.
+_loaded_configs = {}
+
 
 def _create_basic_options():
   """Set the most basic options in the config file."""
@@ -71,6 +74,10 @@ def get_config_path(filename='config',
 def load_configuration(path=None):
   """Loads configuration file.
 
+  The parser for a file is reused on later calls as long as the file has not
+  been changed by anything else, so options it has already looked up do not
+  need to be looked up again.
+
   Args:
     path: Path to the configuration file. Default None for the default location.
 
@@ -82,6 +89,9 @@ def load_configuration(path=None):
     if not path:
       LOG.error('Could not create config directory!')
       return False
+  config = _loaded_configs.get(path)
+  if config is not None and config.is_current():
+    return config
   config = parser.ConfigParser(ConfigParser.ConfigParser)
   config.associate(path)
   made_changes = config.ensure_basic_options(_create_basic_options())
@@ -90,4 +100,5 @@ def load_configuration(path=None):
   # Set the encoding again, now that the config file is loaded.
   # (the config file may have a default encoding setting)
   googlecl.TERMINAL_ENCODING = googlecl.determine_terminal_encoding(config)
+  _loaded_configs[path] = config
   return config
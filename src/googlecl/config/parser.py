@@ -21,6 +21,10 @@ import os.path
 LOGGER_NAME = __name__
 LOG = logging.getLogger(LOGGER_NAME)
 
+# Marks an option that has not been looked up yet, since None is a valid
+# (cached) result of safe_get.
+_MISSING = object()
+
 
 class ConfigParser(object):
   def __init__(self, config_parser_class):
@@ -35,19 +39,43 @@ class ConfigParser(object):
     except:
       pass
     self.path = None
+    # Modification time of the associated file when it was last read or
+    # written by this instance.
+    self.mtime = None
+    # Whether options have been set since the file was last read or written.
+    self.has_unsaved_changes = False
+    # Maps (section, option) to the result of safe_get().
+    self._cache = {}
 
   def associate(self, config_file_path):
     """Associates parser with a config file.
 
     Config file is read from config_file_path as well.
     """
+    self._cache.clear()
+    self.has_unsaved_changes = False
     if os.path.exists(config_file_path):
       LOG.debug('Reading configuration from %s', config_file_path)
       self.parser.read(config_file_path)
+      self.mtime = os.path.getmtime(config_file_path)
     else:
       LOG.debug('Config file does not exist, starting with empty parser')
+      self.mtime = None
     self.path = config_file_path
 
+  def is_current(self):
+    """Checks if the instance and its associated file still agree.
+
+    Returns:
+      True if the file has not been modified since this instance last read
+      or wrote it, and no options have been set since then. False otherwise.
+    """
+    if self.has_unsaved_changes:
+      return False
+    if not self.path or not os.path.exists(self.path):
+      return False
+    return os.path.getmtime(self.path) == self.mtime
+
   def ensure_basic_options(self, basic_options):
     """Sets options if they are missing.
 
@@ -123,15 +151,26 @@ class ConfigParser(object):
       return value
 
   def safe_get(self, section, option):
-    """Returns option if section and option exist, None if they do not."""
-    if (self.parser.has_section(section) and
-        self.parser.has_option(section, option)):
-      return self.parser.get(section, option)
-    else:
-      return None
+    """Returns option if section and option exist, None if they do not.
+
+    Results are cached, so repeated lookups of the same option do not go
+    through the underlying parser again.
+    """
+    key = (section, option)
+    value = self._cache.get(key, _MISSING)
+    if value is _MISSING:
+      if (self.parser.has_section(section) and
+          self.parser.has_option(section, option)):
+        value = self.parser.get(section, option)
+      else:
+        value = None
+      self._cache[key] = value
+    return value
 
   def set(self, section, option, value):
     """Sets option in a section."""
+    self._cache.pop((section, option), None)
+    self.has_unsaved_changes = True
     return self.parser.set(section, option, value)
 
   def set_missing_default(self, section, option, value):
@@ -171,3 +210,6 @@ class ConfigParser(object):
         raise IOError('No path given or associated')
     with open(path, 'w') as config_file:
       self.parser.write(config_file)
+    if path == self.path:
+      self.mtime = os.path.getmtime(path)
+      self.has_unsaved_changes = False
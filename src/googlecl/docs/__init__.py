@@ -60,8 +60,8 @@ def get_document_type(entry):
 
 def get_extension_from_doctype(doctype_label, config_parser):
   """Return file extension based on document type and preferences file."""
-  LOG.debug('In get_extension_from_doctype, doctype_label: ' +
-             str(doctype_label))
+  LOG.debug('In get_extension_from_doctype, doctype_label: %s',
+            doctype_label)
   ext = None
   if doctype_label == SPREADSHEET_LABEL:
     ext = config_parser.safe_get(SECTION_HEADER, 'spreadsheet_format')
@@ -95,7 +95,7 @@ def get_editor(doctype_label, config_parser):
   Returns:
     Editor to use to edit the document.
   """
-  LOG.debug('In get_editor, doctype_label: ' + str(doctype_label))
+  LOG.debug('In get_editor, doctype_label: %s', doctype_label)
   editor = None
   if doctype_label == SPREADSHEET_LABEL:
     editor = config_parser.safe_get(SECTION_HEADER, 'spreadsheet_editor')
@@ -168,7 +168,7 @@ def _run_edit(client, options, args):
   if args:
     LOG.info('Sorry, no support for additional arguments for '
              '"docs edit" yet')
-    LOG.debug('(Ignoring ' + unicode(args) +')')
+    LOG.debug('(Ignoring %s)', args)
 
   # python gdata 2.0.15 removed Download and added DownloadResource.
   if not hasattr(client, 'Download') and \
@@ -210,7 +210,7 @@ class DocsBaseCL(object):
       else:
         entry_file_ext = file_ext
       if entry_file_ext:
-        LOG.debug('Decided file_ext is ' + entry_file_ext)
+        LOG.debug('Decided file_ext is %s', entry_file_ext)
         extension = '.' + entry_file_ext
       else:
         LOG.debug('Could not (or would not) set file_ext')
@@ -308,7 +308,7 @@ class DocsBaseCL(object):
           else:
             fentry = self._create_folder(folder_name, folder_root)
           folder_entries[dirpath] = fentry
-          LOG.debug('Created folder ' + dirpath + ' ' + folder_name)
+          LOG.debug('Created folder %s %s', dirpath, folder_name)
           for fname in filenames:
             doc = self.upload_single_doc(os.path.join(dirpath, fname),
                                          folder_entry=fentry)
@@ -0,0 +1,67 @@
+#!/usr/bin/python
+#
+# Copyright (C) 2010 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the utility functions in the googlecl package."""
+
+import googlecl
+import unittest
+
+
+EXTENSION_TESTS = {'photo.jpg': 'jpg',
+                   'photos/vacation2009/IMG_0001.JPG': 'JPG',
+                   'archive.tar.gz': 'gz',
+                   'video.mp4': 'mp4',
+                   u'notes.txt': u'txt',
+                   '.bashrc': 'bashrc',
+                   'noextension': None,
+                   'short.c': None,
+                   'trailing.': None,
+                   'dir.v2/file': None,
+                   'bad.j-g': None,
+                   u'unicode.\u65e5\u672c': None}
+
+
+class GetExtensionFromPathTest(unittest.TestCase):
+
+  def testExtensions(self):
+    for path, expected_ext in EXTENSION_TESTS.items():
+      self.assertEqual(expected_ext, googlecl.get_extension_from_path(path),
+                       'Wrong extension for %r' % path)
+
+
+class BuildTitlesListTest(unittest.TestCase):
+
+  def testTitleAndArgs(self):
+    self.assertEqual(['title', 'a', 'b'],
+                     googlecl.build_titles_list('title', ['a', 'b']))
+
+  def testArgsOnly(self):
+    self.assertEqual(['a', 'b'], googlecl.build_titles_list(None, ['a', 'b']))
+
+  def testTitleOnly(self):
+    self.assertEqual(['title'], googlecl.build_titles_list('title', []))
+
+  def testNeither(self):
+    self.assertEqual([None], googlecl.build_titles_list(None, []))
+
+  def testArgsNotModified(self):
+    args = ['a', 'b']
+    googlecl.build_titles_list('title', args)
+    self.assertEqual(['a', 'b'], args)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -183,7 +183,7 @@ class PhotosServiceCL(PhotosService, googlecl.service.BaseServiceCL):
           wanted_content = content
       if not wanted_content:
         LOG.error('Did not find desired medium!')
-        LOG.debug('photo_or_video.media:\n' + photo_or_video.media)
+        LOG.debug('photo_or_video.media:\n%s', photo_or_video.media)
         return None
       elif wanted_content.medium == 'image':
         url = googlecl.picasa.make_download_url(photo_or_video.content.src)
@@ -287,7 +287,7 @@ class PhotosServiceCL(PhotosService, googlecl.service.BaseServiceCL):
 
       ext = googlecl.get_extension_from_path(path)
       if not ext:
-        LOG.debug('No extension match on path ' + path)
+        LOG.debug('No extension match on path %s', path)
         content_type = 'image/jpeg'
       else:
         ext = ext.lower()
@@ -316,7 +316,8 @@ class PhotosServiceCL(PhotosService, googlecl.service.BaseServiceCL):
         failures.append(file)
     if failures:
       LOG.info(str(len(failures)) + ' photos failed to upload')
-      LOG.debug(safe_encode('Failed files: ' + unicode(failures)))
+      if LOG.isEnabledFor(logging.DEBUG):
+        LOG.debug(safe_encode('Failed files: ' + unicode(failures)))
     return failures
 
   InsertMediaList = insert_media_list
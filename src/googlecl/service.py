@@ -105,7 +105,7 @@ class BaseServiceCL(googlecl.base.BaseCL):
     if not isinstance(scopes, list):
       scopes = [scopes,]
     scopes.extend(['https://www.googleapis.com/auth/userinfo#email'])
-    LOG.debug('Scopes being requested: ' + str(scopes))
+    LOG.debug('Scopes being requested: %s', scopes)
 
     try:
       request_token = self.FetchOAuthRequestToken(scopes=scopes,